@@ -1,9 +1,13 @@
 
-from flask import Flask, render_template, request
+from flask import Flask, jsonify, render_template, request
 from chandas import analyze_text
 import os
 app = Flask(__name__)
 
+# /identify_batch limits, so one request can't hold a worker indefinitely
+MAX_BATCH_SHLOKAS = 100
+MAX_SHLOKA_CHARS = 5000
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     result = None
@@ -15,10 +19,31 @@ def index():
     return render_template("index.html", result=result, sample=sample)
 
 
+@app.route("/identify_batch", methods=["POST"])
+def identify_batch():
+    # JSON body: {"shlokas": ["...", ...], "script": "auto" | "devanagari" | "latin"}
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "expected a JSON object"}), 400
+    shlokas = data.get("shlokas")
+    if not isinstance(shlokas, list) or not all(isinstance(s, str) for s in shlokas):
+        return jsonify({"error": "'shlokas' must be a list of strings"}), 400
+    if len(shlokas) > MAX_BATCH_SHLOKAS:
+        return jsonify({"error": f"at most {MAX_BATCH_SHLOKAS} shlokas per request"}), 400
+    if any(len(s) > MAX_SHLOKA_CHARS for s in shlokas):
+        return jsonify({"error": f"each shloka must be at most {MAX_SHLOKA_CHARS} characters"}), 400
+    prefer_script = data.get("script", "auto")
+    if not isinstance(prefer_script, str):
+        return jsonify({"error": "'script' must be a string"}), 400
+    results = [analyze_text(text.strip(), prefer_script) for text in shlokas]
+    return jsonify({"results": results})
+
+
 @app.route("/help")
 def help_page():
     return render_template("help.html")
 
 if __name__ == "__main__":
+    # Development server only; production runs under gunicorn via wsgi.py
     port = int(os.environ.get("PORT", 5000))
-    app.run(host="0.0.0.0", port=port, debug=True)
+    app.run(host="0.0.0.0", port=port, debug=os.environ.get("CHANDKOSH_DEBUG") == "1")
@@ -1,5 +1,7 @@
 import re
+import unicodedata
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 
 # ------------------------ Toggle: force confidence = 1.0 everywhere ------------------------ #
@@ -9,18 +11,45 @@ FORCE_CONFIDENCE_ALWAYS_ONE = False  # set True to always show 1.0
 
 DEV_INDEP_VOWELS = set("अआइईउऊऋॠऌॡएऐओऔ")
 DEV_VOWEL_SIGNS = set("ािीुूृॄॢॣेैोौ")
-DEV_CONSONANTS = set("कखगघङचछजझञटठडढणतथदधनपफबभमयरलवशषसहक़ख़ग़ज़ड़ढ़फ़य़ऱऴ")
+DEV_CONSONANTS = set("कखगघङचछजझञटठडढणतथदधनपफबभमयरलवशषसहक़ख़ग़ज़ड़ढ़फ़य़ऩऱऴ")
 DEV_ANUSVARA = "ं"
 DEV_CHANDRABINDU = "ँ"
 DEV_VISARGA = "ः"
 DEV_VIRAMA = "्"
+DEV_NUKTA = "\u093C"
 DEV_DANDA = "।"
 DEV_DDANDA = "॥"
-DEV_AVAGRAHA = "ऽ"
+DEV_AVAGRAHA = "ऽ"  # not a syllable: has no DEV_LUT class bits, so the parser skips it
 OM = "ॐ"
 
 DEV_LONG_VOWELS = set("आईऊॠॡएऐओऔ")
 DEV_SHORT_VOWELS = set("अइउऋऌ")
+DEV_LONG_MATRAS = set("ाीूॄॣेैोौ")
+
+# Per-character class bits for the Devanagari block (U+0900–U+097F)
+DEV_CLS_INDEP_VOWEL = 0x01
+DEV_CLS_CONSONANT = 0x02
+DEV_CLS_VOWEL_SIGN = 0x04
+DEV_CLS_MARK = 0x08       # anusvara/chandrabindu/visarga
+DEV_CLS_VIRAMA = 0x10
+DEV_CLS_LONG = 0x20       # long independent vowel or long matra
+
+def _build_dev_lut() -> bytearray:
+    lut = bytearray(0x80)
+    for chars, bit in (
+        (DEV_INDEP_VOWELS, DEV_CLS_INDEP_VOWEL),
+        (DEV_CONSONANTS, DEV_CLS_CONSONANT),
+        (DEV_VOWEL_SIGNS, DEV_CLS_VOWEL_SIGN),
+        ((DEV_ANUSVARA, DEV_CHANDRABINDU, DEV_VISARGA), DEV_CLS_MARK),
+        (DEV_VIRAMA, DEV_CLS_VIRAMA),
+        (DEV_LONG_VOWELS, DEV_CLS_LONG),
+        (DEV_LONG_MATRAS, DEV_CLS_LONG),
+    ):
+        for ch in chars:
+            lut[ord(ch) - 0x900] |= bit
+    return lut
+
+DEV_LUT = _build_dev_lut()
 
 # ------------------------ Latin (IAST-oriented) ------------------------ #
 
@@ -30,6 +59,7 @@ LATIN_VOWEL_CHARS = {
 LATIN_DIPHTHONGS = {"ai", "au"}  # long by nature
 LATIN_LONG = {"ā", "ī", "ū", "ṝ", "ḹ", "e", "o"}  # e/o long by nature in Sanskrit
 LATIN_SHORT = {"a", "i", "u", "ṛ", "ḷ"}
+_LATIN_LONG_NUCLEI = frozenset(LATIN_LONG | LATIN_DIPHTHONGS)
 
 # Consonant digraphs to treat as one unit for onset counting
 DIGRAPHS = {"kh", "gh", "ch", "jh", "ṭh", "ḍh", "th", "dh", "ph", "bh"}
@@ -52,6 +82,53 @@ CHANDAS_SAPT = [
     {"name": "Jagati",    "padas": 4, "syllables_per_pada": 12},
 ]
 
+# (name, padas, syllables_per_pada) rows, unpacked once for the scoring loops
+_SAPT_TARGETS = [(c["name"], c["padas"], c["syllables_per_pada"]) for c in CHANDAS_SAPT]
+# (padas, syllables_per_pada) -> meter, for exact-match lookups
+_SAPT_BY_SHAPE = {(c["padas"], c["syllables_per_pada"]): c for c in CHANDAS_SAPT}
+
+# ------------------------ Precompiled regexes ------------------------ #
+
+# Runs of whitespace and/or anything outside: word chars, full Devanagari block,
+# combining marks, danda/double-danda, and the '|' pada separator.
+_CLEAN_RE = re.compile(r"[^\w\u0900-\u097F\u0300-\u036F|{}{}]+".format(DEV_DANDA, DEV_DDANDA), re.UNICODE)
+# Line breaks or danda/vertical bars
+_SEG_RE = re.compile(r"[|{}{}\n\r]+".format(DEV_DANDA, DEV_DDANDA))
+
+# Invariant: every Latin class below accepts exactly the characters whose str.lower()
+# is the target letter, matching the old `s.lower() in ...` checks. For these letters
+# that is the letter, its str.upper(), and the few extra characters listed in
+# _LOWER_ALIASES (KELVIN SIGN U+212A lowercases to "k"). re.IGNORECASE is avoided:
+# its case folding also maps dotless ı / dotted İ to i, which str.lower() does not.
+_LOWER_ALIASES = {"k": "\u212A"}
+
+def _latin_ci(s: str) -> str:
+    # "kh" -> "[kK\u212A][hH]": one class per letter, per the invariant above
+    return "".join("[{}{}{}]".format(ch, ch.upper(), _LOWER_ALIASES.get(ch, "")) for ch in s)
+
+# One Latin syllable: onset consonant units (any letter; digraphs first) up to a vowel,
+# then the nucleus, then optional chandrabindu/anusvara/visarga (case-sensitive).
+# Matching stays linear: each onset position has a single parse (the single-letter
+# branch refuses a digraph start), and the syllable part is optional, so the greedy
+# onset never backtracks and a vowel-less letter run is consumed by one match
+# (skipped by the parser) rather than rescanned from every position.
+_LATIN_VOWEL_CLASS = "[{}]".format("".join(sorted(
+    LATIN_VOWEL_CHARS | {ch.upper() for ch in LATIN_VOWEL_CHARS})))
+_LATIN_SYL_RE = re.compile(
+    r"(?=[^\W\d_])"
+    r"(?P<onset>(?:(?!{v}|[{am}])(?:{dg}|(?!{dg})[^\W\d_]))*)"
+    r"(?:(?P<nucleus>{dip}|{v})"
+    r"(?P<marks>(?:{cb})?[{anu}]?[{vis}]?))?".format(
+        v=_LATIN_VOWEL_CLASS,
+        am="".join(sorted(LATIN_ANUSVARA | LATIN_VISARGA)),
+        dg="|".join(_latin_ci(d) for d in sorted(DIGRAPHS)),
+        dip="|".join(_latin_ci(d) for d in sorted(LATIN_DIPHTHONGS)),
+        cb="|".join(sorted(LATIN_CHANDRABINDU)),
+        anu="".join(sorted(LATIN_ANUSVARA)),
+        vis="".join(sorted(LATIN_VISARGA)),
+    )
+)
+
 # ------------------------ Utilities ------------------------ #
 
 def detect_script(text: str, prefer: str = "auto") -> str:
@@ -63,26 +140,27 @@ def detect_script(text: str, prefer: str = "auto") -> str:
     return "latin"
 
 def normalize_text(text: str) -> str:
+    # Canonical composition first, so NFD input (e.g. decomposed ṁ) parses like NFC
+    text = unicodedata.normalize("NFC", text)
+    # NFC splits क़/ख़/... into consonant + nukta; nukta doesn't affect weight
+    text = text.replace(DEV_NUKTA, "")
     # Normalize OM to a long-vowel + anusvara to reflect heaviness
     text = text.replace(OM, "ओं")
     # Standardize dandas
     text = text.replace(DEV_DDANDA, DEV_DANDA)
-    # Keep: all word chars, full Devanagari block, combining marks, whitespace,
-    # danda/double-danda, and the '|' pada separator.
-    pattern = r"[^\w\u0900-\u097F\u0300-\u036F\s|{}{}]+".format(DEV_DANDA, DEV_DDANDA)
-    text = re.sub(pattern, " ", text, flags=re.UNICODE)
-    # Replace underscores left by \w, then collapse spaces
+    # \w would otherwise keep underscores
     text = text.replace("_", " ")
-    text = re.sub(r"\s+", " ", text).strip()
+    # Replace punctuation and collapse whitespace in one regex pass
+    text = _CLEAN_RE.sub(" ", text).strip()
     return text
 
 def split_segments(text: str) -> List[str]:
     # Split on line breaks or danda/vertical bars
-    parts = re.split(r"[|{}{}\n\r]+".format(DEV_DANDA, DEV_DDANDA), text)
+    parts = _SEG_RE.split(text)
     parts = [p.strip() for p in parts if p.strip()]
     return parts
 
-@dataclass
+@dataclass(slots=True)
 class Syllable:
     onset_len: int
     nucleus_char: str       # vowel nucleus (dev: vowel/matra; latin: vowel/diphthong)
@@ -95,55 +173,56 @@ class Syllable:
 
 def parse_dev_syllables(text: str) -> List[Syllable]:
     sylls: List[Syllable] = []
+    # Local aliases: the loop below tests these on every character
+    indep_bit, cons_bit, sign_bit = DEV_CLS_INDEP_VOWEL, DEV_CLS_CONSONANT, DEV_CLS_VOWEL_SIGN
+    mark_bit, virama_bit, long_bit = DEV_CLS_MARK, DEV_CLS_VIRAMA, DEV_CLS_LONG
+    lut = DEV_LUT
+    # Classify every character once; anything outside the Devanagari block
+    # (spaces, Latin, etc.) gets class 0 and is skipped.
+    cls = [lut[o - 0x900] if 0x900 <= o < 0x980 else 0 for o in map(ord, text)]
     i, n = 0, len(text)
     while i < n:
         ch = text[i]
-
-        # Skip spaces, punctuation except prosodic marks
-        if ch in {" ", DEV_AVAGRAHA}:
-            i += 1
-            continue
+        c = cls[i]
 
         # Independent vowel syllable
-        if ch in DEV_INDEP_VOWELS:
+        if c & indep_bit:
             nucleus = ch
-            intrinsic_long = ch in DEV_LONG_VOWELS
-            marks = ""
+            intrinsic_long = bool(c & long_bit)
             j = i + 1
-            while j < n and text[j] in {DEV_ANUSVARA, DEV_CHANDRABINDU, DEV_VISARGA}:
-                marks += text[j]
+            while j < n and cls[j] & mark_bit:
                 j += 1
-            raw = text[i:j]
+            if sylls:
+                # No onset, so the previous syllable is heavy only by its own weight
+                prev = sylls[-1]
+                prev.heavy = prev.intrinsic_long or prev.has_mark
             sylls.append(Syllable(
                 onset_len=0,
                 nucleus_char=nucleus,
                 intrinsic_long=intrinsic_long,
-                has_mark=len(marks) > 0,
-                raw=raw
+                has_mark=j > i + 1,
+                raw=text[i:j]
             ))
             i = j
             continue
 
         # Consonant onset cluster
-        if ch in DEV_CONSONANTS:
+        if c & cons_bit:
             onset_len = 1
             j = i
-            raw = ch
             # Consume C + virama + C ... (onset cluster)
-            while (j + 2) < n and text[j + 1] == DEV_VIRAMA and text[j + 2] in DEV_CONSONANTS:
+            while (j + 2) < n and cls[j + 1] & virama_bit and cls[j + 2] & cons_bit:
                 j += 2
                 onset_len += 1
-                raw += text[j - 1] + text[j]
             j += 1  # move past last onset consonant
 
             nucleus = None
             intrinsic_long = False
 
             # vowel sign if present
-            if j < n and text[j] in DEV_VOWEL_SIGNS:
+            if j < n and cls[j] & sign_bit:
                 nucleus = text[j]
-                intrinsic_long = nucleus in set("ाीूॄॣेैोौ")  # long matras
-                raw += nucleus
+                intrinsic_long = bool(cls[j] & long_bit)  # long matras
                 j += 1
             else:
                 # inherent 'a' (short)
@@ -151,155 +230,98 @@ def parse_dev_syllables(text: str) -> List[Syllable]:
                 intrinsic_long = False
 
             # marks
-            marks = ""
-            while j < n and text[j] in {DEV_ANUSVARA, DEV_CHANDRABINDU, DEV_VISARGA}:
-                marks += text[j]
-                raw += text[j]
+            has_mark = False
+            while j < n and cls[j] & mark_bit:
+                has_mark = True
                 j += 1
 
             # Special case: halant at end (coda) -> make previous syllable heavy, consume codas
-            if j < n and text[j] == DEV_VIRAMA:
+            if j < n and cls[j] & virama_bit:
                 if sylls:
                     sylls[-1].heavy = True
-                while j < n and text[j] == DEV_VIRAMA:
-                    raw += text[j]
+                while j < n and cls[j] & virama_bit:
                     j += 1
-                    if j < n and text[j] in DEV_CONSONANTS:
-                        raw += text[j]
+                    if j < n and cls[j] & cons_bit:
                         j += 1
                 i = j
                 continue
 
+            if sylls:
+                # Onset now known: settle the previous syllable's weight
+                prev = sylls[-1]
+                prev.heavy = prev.intrinsic_long or prev.has_mark or onset_len >= 2
             sylls.append(Syllable(
                 onset_len=onset_len,
                 nucleus_char=nucleus,
                 intrinsic_long=intrinsic_long,
-                has_mark=len(marks) > 0,
-                raw=raw
+                has_mark=has_mark,
+                raw=text[i:j]  # the syllable is one contiguous run
             ))
             i = j
             continue
 
         # Prosodic marks alone: attach to previous syllable if possible
-        if ch in {DEV_ANUSVARA, DEV_CHANDRABINDU, DEV_VISARGA}:
+        if c & mark_bit:
             if sylls:
                 sylls[-1].has_mark = True
                 sylls[-1].raw += ch
             i += 1
             continue
 
-        # Danda or other: skip
+        # Spaces, avagraha, danda or other: skip
         i += 1
 
     return sylls
 
 # ------------------------ Latin parsing ------------------------ #
 
-def is_vowel_start_latin(s: str, i: int) -> int:
-    # Returns length (1 or 2) of vowel nucleus if found, else 0
-    if i >= len(s):
-        return 0
-    # diphthongs 'ai','au'
-    if i + 1 < len(s) and s[i:i+2].lower() in LATIN_DIPHTHONGS:
-        return 2
-    ch = s[i]
-    if ch.lower() in LATIN_VOWEL_CHARS:
-        return 1
-    return 0
-
-def consume_consonant_unit(s: str, i: int) -> int:
-    # Consume one consonant unit (handles digraphs like kh, gh, etc.)
-    if i >= len(s):
-        return i
-    if i + 1 < len(s) and s[i:i+2].lower() in DIGRAPHS:
-        return i + 2
-    return i + 1
-
 def parse_latin_syllables(text: str) -> List[Syllable]:
-    s = text
     sylls: List[Syllable] = []
-    i, n = 0, len(s)
-
-    while i < n:
-        ch = s[i]
-
-        # Skip spaces/punct except marks
-        if ch.isspace() or ch in "|/\\,.;:!?'\"“”‘’()[]{}-":
-            i += 1
-            continue
-
-        # Build onset cluster
-        onset_len = 0
-        j = i
-        while j < n and is_vowel_start_latin(s, j) == 0:
-            if s[j] in LATIN_ANUSVARA or s[j] in LATIN_VISARGA:
-                break
-            if s[j].isalpha() or s[j] in "ṅñṇḍṭśṣḥṁṃḷṛ":
-                j2 = consume_consonant_unit(s, j)
-                if is_vowel_start_latin(s, j) == 0:
-                    onset_len += 1
-                    j = j2
-                    continue
-            break
-
-        # Now at vowel
-        vlen = is_vowel_start_latin(s, j)
-        if vlen == 0:
-            i = j + 1 if j == i else j
-            continue
-
-        nucleus = s[j:j+vlen]
-        nucleus_low = nucleus.lower()
-        intrinsic_long = (nucleus_low in LATIN_LONG) or (nucleus_low in LATIN_DIPHTHONGS)
-
-        k = j + vlen
-        marks = False
-        # Optional prosodic marks
-        if k < n:
-            nxt2 = s[k:k+2]
-            if nxt2 in LATIN_CHANDRABINDU:
-                marks = True
-                k += 2
-
-        if k < n and s[k] in LATIN_ANUSVARA:
-            marks = True
-            k += 1
-        if k < n and s[k] in LATIN_VISARGA:
-            marks = True
-            k += 1
-
-        raw = s[i:k]
+    # Local aliases for the per-syllable lookups below
+    long_nuclei, digraphs = _LATIN_LONG_NUCLEI, DIGRAPHS
+    for m in _LATIN_SYL_RE.finditer(text):
+        onset, nucleus, raw = m.group("onset"), m.group("nucleus"), m.group(0)
+        if nucleus is None:
+            continue  # letters with no vowel after them (e.g. word-final consonants)
+        if onset and not onset.isalpha():
+            # [^\W\d_] also admits non-decimal numerics (², ½); they break the onset
+            cut = max(k for k, ch in enumerate(onset) if not ch.isalpha()) + 1
+            onset, raw = onset[cut:], raw[cut:]
+        # Digraphs (kh, gh, ...) count as a single onset consonant
+        onset_len = len(onset)
+        if onset_len > 1 and "h" in onset.lower():
+            onset_len -= sum(onset.lower().count(d) for d in digraphs)
+        intrinsic_long = nucleus.lower() in long_nuclei
+        if sylls:
+            # Onset now known: settle the previous syllable's weight
+            prev = sylls[-1]
+            prev.heavy = prev.intrinsic_long or prev.has_mark or onset_len >= 2
         sylls.append(Syllable(
             onset_len=onset_len,
             nucleus_char=nucleus,
             intrinsic_long=intrinsic_long,
-            has_mark=marks,
+            has_mark=bool(m.group("marks")),
             raw=raw
         ))
-        i = k
-
     return sylls
 
 # ------------------------ Prosodic logic ------------------------ #
 
 def finalize_heaviness(padas_sylls: List[List[Syllable]]) -> None:
-    # Apply Laghu/Guru rules:
+    # Only valid for syllables from parse_dev_syllables / parse_latin_syllables:
+    # this sets the pada-end syllable heavy and relies on the parsers for the rest.
+    #
+    # Laghu/Guru rules:
     # - Long vowel nuclei are guru
     # - Anusvara/Visarga/Chandrabindu makes guru
     # - Short vowel becomes guru if:
     #    a) it's the end of a pada, or
     #    b) next syllable onset cluster length >= 2 (conjunct)
+    # The parsers apply all but (a) as they go, once the next syllable's onset is
+    # known. Pada ends depend on how segments were split, so (a) is applied here.
     for p in padas_sylls:
-        for idx, syl in enumerate(p):
-            heavy = syl.intrinsic_long or syl.has_mark
-            if not heavy:
-                if idx == len(p) - 1:
-                    heavy = True  # pada end
-                else:
-                    nxt = p[idx + 1]
-                    if nxt.onset_len >= 2:
-                        heavy = True
-            syl.heavy = heavy
+        if p:
+            p[-1].heavy = True
 
 def syllable_pattern(pada: List[Syllable]) -> str:
     return "".join("G" if s.heavy else "L" for s in pada)
@@ -323,33 +345,35 @@ def confidence_from_deviations(target_len: int, deviations: List[int]) -> float:
 # ------------------------ Meter identification ------------------------ #
 
 def best_meter_match(padas_syll_counts: List[int]) -> Dict[str, Any]:
-    candidates = []
     total_padas = len(padas_syll_counts)
+    best_score, best_target = None, None
 
-    for cand in CHANDAS_SAPT:
-        target_padas = cand["padas"]
-        target_len = cand["syllables_per_pada"]
-
+    for target in _SAPT_TARGETS:
+        _, target_padas, target_len = target
         # score based on differences and pada mismatch
         pad_penalty = abs(total_padas - target_padas) * 4
-        diffs = []
-        k = min(total_padas, target_padas)
-        for i in range(k):
-            diffs.append(abs(padas_syll_counts[i] - target_len))
-        if total_padas < target_padas:
-            diffs += [target_len] * (target_padas - total_padas)  # missing padas worst-case
-        score = pad_penalty + sum(diffs)
-
-        candidates.append({
-            "name": cand["name"],
-            "target_padas": target_padas,
-            "target_len": target_len,
-            "score": score,
-            "deviations": diffs or [target_len] * target_padas
-        })
+        missing = max(0, target_padas - total_padas)  # missing padas count worst-case
+        score = pad_penalty + target_len * missing
+        for c in padas_syll_counts[:target_padas]:
+            score += abs(c - target_len)
+        # Strict '<' keeps the first of equal scores, in CHANDAS_SAPT order
+        if best_score is None or score < best_score:
+            best_score, best_target = score, target
+            if score == 0:
+                break
 
-    candidates.sort(key=lambda x: x["score"])
-    best = candidates[0]
+    name, target_padas, target_len = best_target
+
+    # Per-pada deviations are only needed for the winner
+    diffs = [abs(c - target_len) for c in padas_syll_counts[:target_padas]]
+    if total_padas < target_padas:
+        diffs += [target_len] * (target_padas - total_padas)
+    best = {
+        "name": name,
+        "target_padas": target_padas,
+        "target_len": target_len,
+        "deviations": diffs or [target_len] * target_padas,
+    }
     conf = confidence_from_deviations(best["target_len"], best["deviations"])
     return {
         "name": best["name"],
@@ -369,16 +393,24 @@ def identify_saptachandas(padas_syll_counts: List[int], tolerance: int = 0) -> O
     """
     total_padas = len(padas_syll_counts)
     matches = []
-    for cand in CHANDAS_SAPT:
-        if total_padas != cand["padas"]:
-            continue
-        target = cand["syllables_per_pada"]
-        deviations = [abs(c - target) for c in padas_syll_counts]
-        if not deviations:
-            continue
-        max_dev = max(deviations)
-        if max_dev <= tolerance:
-            matches.append((max_dev, sum(deviations), cand, deviations))
+    if tolerance == 0:
+        # An exact match needs every pada at the same length: one dict lookup
+        cand = None
+        if padas_syll_counts and padas_syll_counts.count(padas_syll_counts[0]) == total_padas:
+            cand = _SAPT_BY_SHAPE.get((total_padas, padas_syll_counts[0]))
+        if cand is not None:
+            matches.append((0, 0, cand, [0] * total_padas))
+    else:
+        for cand in CHANDAS_SAPT:
+            if total_padas != cand["padas"]:
+                continue
+            target = cand["syllables_per_pada"]
+            deviations = [abs(c - target) for c in padas_syll_counts]
+            if not deviations:
+                continue
+            max_dev = max(deviations)
+            if max_dev <= tolerance:
+                matches.append((max_dev, sum(deviations), cand, deviations))
 
     if not matches:
         return None
@@ -421,9 +453,7 @@ def guess_split_into_padas(segments_sylls: List[List[Syllable]]) -> List[List[Sy
     # Fallback: return as-is
     return segments_sylls
 
-def analyze_text(text: str, prefer_script: str = "auto") -> Dict[str, Any]:
-    raw = text or ""
-    norm = normalize_text(raw)
+def _analyze_normalized(norm: str, prefer_script: str) -> Dict[str, Any]:
     script = detect_script(norm, prefer_script)
 
     # Split into textual segments (lines/padas)
@@ -472,4 +502,26 @@ def analyze_text(text: str, prefer_script: str = "auto") -> Dict[str, Any]:
             ("Within ±1 tolerance" if (tolerant and best is tolerant) else
              "Closest based on counts; may be approximate")
         )
-    }
\ No newline at end of file
+    }
+
+# Cache of analysis results per (normalized text, script preference). Inputs longer
+# than ANALYSIS_CACHE_MAX_CHARS are analyzed without caching, so memory stays bounded.
+ANALYSIS_CACHE_MAX_CHARS = 2000
+_analyze_cached = lru_cache(maxsize=4096)(_analyze_normalized)
+
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    # Copy the mutable parts of a cached result (values inside are str/int/float)
+    out = dict(result)
+    out["padas"] = [dict(p) for p in result["padas"]]
+    out["pada_counts"] = list(result["pada_counts"])
+    guess = out["guess"] = dict(result["guess"])
+    guess["deviations"] = list(guess["deviations"])
+    return out
+
+def analyze_text(text: str, prefer_script: str = "auto") -> Dict[str, Any]:
+    raw = text or ""
+    norm = normalize_text(raw)
+    if len(norm) > ANALYSIS_CACHE_MAX_CHARS:
+        return _analyze_normalized(norm, prefer_script)
+    # Return a copy so callers can't mutate the cached entry
+    return _copy_result(_analyze_cached(norm, prefer_script))
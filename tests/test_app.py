@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("flask")
+
+from app import MAX_BATCH_SHLOKAS, MAX_SHLOKA_CHARS, app
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def test_identify_batch_returns_one_result_per_shloka(client):
+    resp = client.post("/identify_batch", json={"shlokas": ["tat savitur vareṇyaṃ", "असतो मा सद्गमय"]})
+    assert resp.status_code == 200
+    assert len(resp.get_json()["results"]) == 2
+
+
+@pytest.mark.parametrize("body", [
+    [1],
+    {"shlokas": "x"},
+    {"shlokas": [], "script": [1]},
+    {"shlokas": ["a"] * (MAX_BATCH_SHLOKAS + 1)},
+    {"shlokas": ["a" * (MAX_SHLOKA_CHARS + 1)]},
+])
+def test_identify_batch_rejects_bad_bodies(client, body):
+    resp = client.post("/identify_batch", json=body)
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
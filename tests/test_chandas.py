@@ -0,0 +1,88 @@
+import time
+
+import chandas
+from chandas import analyze_text, parse_latin_syllables
+
+
+def test_latin_vowelless_runs_parse_in_linear_time():
+    # Digraph runs used to backtrack exponentially, and plain consonant runs
+    # were rescanned from every start position.
+    for text in ("kh" * 2000, "x" * 20000, "kh" * 22 + " " + "x" * 3000):
+        start = time.perf_counter()
+        assert parse_latin_syllables(text) == []
+        assert time.perf_counter() - start < 0.5
+
+
+def test_latin_digraph_onset_counts_once():
+    (syl,) = parse_latin_syllables("khkha")
+    assert syl.onset_len == 2
+    assert syl.raw == "khkha"
+
+
+def test_latin_dotless_and_dotted_i_are_not_vowels():
+    assert [s.nucleus_char for s in parse_latin_syllables("ḥṃı①Ai")] == ["Ai"]
+    assert [s.nucleus_char for s in parse_latin_syllables("İkA")] == ["A"]
+
+
+def test_latin_uppercase_vowels_and_marks():
+    sylls = parse_latin_syllables("RĀmaṃ")
+    assert [(s.nucleus_char, s.intrinsic_long, s.has_mark) for s in sylls] == [
+        ("Ā", True, False),
+        ("a", False, True),
+    ]
+
+
+def test_analyze_sample_is_gayatri():
+    result = analyze_text("tat savitur vareṇyaṃ | bhargo devasya dhīmahi | dhiyo yo naḥ pracodayāt")
+    assert result["pada_counts"] == [7, 8, 8]
+    assert result["guess"]["name"] == "Gayatri"
+
+
+def test_cached_result_is_not_shared_with_callers():
+    text = "असतो मा सद्गमय । तमसो मा ज्योतिर्गमय । मृत्योर् मा अमृतं गमय ॥"
+    first = analyze_text(text)
+    first["padas"][0]["pattern"] = "X"
+    first["pada_counts"].append(0)
+    first["guess"]["deviations"].append(0)
+    assert analyze_text(text) == chandas._analyze_normalized(chandas.normalize_text(text), "auto")
+
+
+def test_long_input_is_not_cached():
+    chandas._analyze_cached.cache_clear()
+    analyze_text("ka " * chandas.ANALYSIS_CACHE_MAX_CHARS)
+    assert chandas._analyze_cached.cache_info().currsize == 0
+
+
+def test_devanagari_sample_patterns():
+    # सद्ग / ज्यो / त्यो: conjunct onsets make the preceding short syllable heavy;
+    # मृत्योर् ends in a halant coda.
+    result = analyze_text("असतो मा सद्गमय । तमसो मा ज्योतिर्गमय । मृत्योर् मा अमृतं गमय ॥")
+    assert [p["pattern"] for p in result["padas"]] == ["LLGGGLLG", "LLGGGGLLG", "GGGLLGLLG"]
+
+
+def test_iast_sample_patterns():
+    # "tat" ends a word in a consonant; "pra", "kṣe" and "ṇḍa" are conjunct onsets
+    result = analyze_text("tat savitur vareṇyaṃ | bhargo devasya dhīmahi | dhiyo yo naḥ pracodayāt")
+    assert [p["pattern"] for p in result["padas"]] == ["LLLLLGG", "GGGGLGLG", "LGGGLGLG"]
+    result = analyze_text(
+        "dharmakṣetre kurukṣetre samavetā yuyutsavaḥ | māmakāḥ pāṇḍavāś caiva kim akurvata sañjaya"
+    )
+    assert [p["pattern"] for p in result["padas"]] == ["GGGGLGGG", "LLGGLGLG", "GLGGLGGG", "LLGLLGLG"]
+
+
+def test_nfd_iast_parses_like_nfc():
+    assert analyze_text("ra\u0304ma") == analyze_text("r\u0101ma")
+    assert analyze_text("ra\u0304ma")["padas"][0]["pattern"] == "G"
+
+
+def test_nukta_consonants_count_as_consonants():
+    # Precomposed क़ (U+0958) is split by NFC into क + nukta; both spellings,
+    # and ऩ both composed (U+0929) and as न + nukta, parse like the base consonant.
+    plain = analyze_text("\u0915\u093e\u0932 \u0928\u092e")  # काल नम
+    for text in (
+        "\u0958\u093e\u0932 \u0929\u092e",
+        "\u0915\u093c\u093e\u0932 \u0928\u093c\u092e",
+    ):
+        result = analyze_text(text)
+        assert sum(result["pada_counts"]) == 4
+        assert result["padas"] == plain["padas"]
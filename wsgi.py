@@ -0,0 +1,3 @@
+# WSGI entry point for production servers, e.g.:
+#   gunicorn -w $(nproc) -k gthread --threads 4 -b 0.0.0.0:$PORT wsgi:application
+from app import app as application